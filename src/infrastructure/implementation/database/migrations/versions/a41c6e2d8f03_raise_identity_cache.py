@@ -0,0 +1,53 @@
+"""raise identity cache of append-heavy tables
+
+Revision ID: a41c6e2d8f03
+Revises: 5d3a1f0c9b7e
+Create Date: 2026-10-15 11:03:27.184652
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "a41c6e2d8f03"
+down_revision = "5d3a1f0c9b7e"
+
+from alembic import op
+import sqlalchemy as sa
+
+
+from alembic import context
+
+
+def upgrade():
+    schema_upgrades()
+    if context.get_x_argument(as_dictionary=True).get("data", None):
+        data_upgrades()
+
+
+def downgrade():
+    if context.get_x_argument(as_dictionary=True).get("data", None):
+        data_downgrades()
+    schema_downgrades()
+
+
+def schema_upgrades():
+    """schema upgrade migrations go here."""
+    op.execute("ALTER TABLE orders ALTER COLUMN id SET CACHE 1000")
+    op.execute("ALTER TABLE order_items ALTER COLUMN id SET CACHE 1000")
+    op.execute("ALTER TABLE products ALTER COLUMN id SET CACHE 1000")
+
+
+def schema_downgrades():
+    """schema downgrade migrations go here."""
+    op.execute("ALTER TABLE products ALTER COLUMN id SET CACHE 5")
+    op.execute("ALTER TABLE order_items ALTER COLUMN id SET CACHE 5")
+    op.execute("ALTER TABLE orders ALTER COLUMN id SET CACHE 5")
+
+
+def data_upgrades():
+    """Add any optional data upgrade migrations here!"""
+    pass
+
+
+def data_downgrades():
+    """Add any optional data downgrade migrations here!"""
+    pass
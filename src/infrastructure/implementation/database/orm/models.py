@@ -8,6 +8,7 @@ from sqlalchemy import (
     Column,
     ForeignKey,
     Identity,
+    Index,
     Integer,
     Table,
     func,
@@ -22,6 +23,8 @@ from src.domain.entities.product import Product
 mapper_registry: registry = registry()
 
 
+# Mapped instances can't use __slots__: SQLAlchemy keeps instance state and loaded values in
+# __dict__, which the domain entities (plain dataclasses) provide anyway.
 class Model(abc.ABC):
     id: int
 
@@ -37,7 +40,7 @@ class OrderModel(Order, Model):
         Column(
             "id",
             INTEGER,
-            Identity(always=True, cache=5),
+            Identity(always=True, cache=1000),
             nullable=False,
             primary_key=True,
         ),
@@ -55,7 +58,8 @@ class OrderModel(Order, Model):
                 name="FK__order_items_users",
             ),
             nullable=False
-        )
+        ),
+        Index("ix_orders_user_id", "user_id"),
     )
 
     __mapper_args__ = {  # type: ignore
@@ -65,15 +69,14 @@ class OrderModel(Order, Model):
                 secondary=lambda: OrderItemModel.__table__,
                 back_populates="orders",
                 enable_typechecks=True,
-                lazy="joined",
+                lazy="selectin",
             ),
             "user": relationship(
                 "UserModel",
                 back_populates="orders",
                 enable_typechecks=True,
-                lazy="joined",
+                lazy="selectin",
                 uselist=False,
-                innerjoin=True
             ),
         }
     }
@@ -87,7 +90,7 @@ class ProductModel(Product, Model):
         Column(
             "id",
             INTEGER,
-            Identity(always=True, cache=5),
+            Identity(always=True, cache=1000),
             nullable=False,
             primary_key=True,
         ),
@@ -121,7 +124,7 @@ class OrderItemModel(OrderItem, Model):
         Column(
             "id",
             INTEGER,
-            Identity(always=True, cache=5),
+            Identity(always=True, cache=1000),
             nullable=False,
             primary_key=True,
         ),
@@ -149,6 +152,7 @@ class OrderItemModel(OrderItem, Model):
             nullable=False
         ),
         Column("quantity", SMALLINT, nullable=False, server_default=text("1")),
+        Index("ix_order_items_product_id", "product_id"),
     )
 
 
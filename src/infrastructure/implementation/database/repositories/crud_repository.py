@@ -1,82 +1,212 @@
 from __future__ import annotations
 
+import functools
+import itertools
 import typing
 
-from sqlalchemy import delete, exists, func, lambda_stmt, select, update
+from sqlalchemy import Table, bindparam, delete, func, literal_column, select, update
 from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.sql import Executable
+from sqlalchemy.engine import Dialect, Row
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.sql import Delete, Select, Update
 
-from src.infrastructure.implementation.database.orm.util.bulk_save import make_proxy_bulk_save_func
 from src.infrastructure.implementation.database.orm.util.typedef import SQLAlchemyModel, ExpressionType
 from src.infrastructure.interfaces.database.repositories.crud_repository import AbstractCRUDRepository
 
-ASTERISK: typing.Final[str] = "*"
+_T = typing.TypeVar("_T")
+_StatementType = typing.TypeVar("_StatementType")
+
+STATEMENT_CACHE_SIZE: typing.Final[int] = 256
+# keeps a multi-row INSERT well below the bind parameters limit of asyncpg
+BULK_INSERT_BATCH_SIZE: typing.Final[int] = 500
+STREAM_YIELD_PER: typing.Final[int] = 500
+# above this amount of rows add_many hands them to the driver's executemany as is,
+# if none of the table's column types needs bind processing
+DRIVER_EXECUTEMANY_THRESHOLD: typing.Final[int] = 100
+
+
+def _cached_per_model(
+        factory: typing.Callable[[typing.Any], _StatementType]
+) -> typing.Callable[[typing.Optional[typing.Type[typing.Any]]], _StatementType]:
+    # model classes are hashable, but mypy doesn't consider Type[...] to be Hashable
+    return typing.cast(
+        typing.Callable[[typing.Optional[typing.Type[typing.Any]]], _StatementType],
+        functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)(factory),
+    )
+
+
+@_cached_per_model
+def _select_statement(model: typing.Type[typing.Any]) -> Select:
+    return select(model)
+
+
+@_cached_per_model
+def _update_statement(model: typing.Type[typing.Any]) -> Update:
+    return update(model)
+
+
+@_cached_per_model
+def _delete_statement(model: typing.Type[typing.Any]) -> Delete:
+    return delete(model)
+
+
+@_cached_per_model
+def _delete_by_pk_statement(model: typing.Type[typing.Any]) -> Delete:
+    # "evaluate" can't see the value of a bind parameter, "fetch" uses RETURNING on PostgreSQL
+    # to remove deleted instances from the identity map
+    return (
+        delete(model)
+        .where(model.id == bindparam("pk"))
+        .execution_options(synchronize_session="fetch")
+    )
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _accepts_driver_values(dialect: Dialect, table: Table) -> bool:
+    return all(
+        column.type.dialect_impl(dialect).bind_processor(dialect) is None for column in table.columns
+    )
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _driver_insert_statement(
+        dialect: Dialect, table: Table, column_keys: typing.Tuple[str, ...]
+) -> str:
+    preparer = dialect.identifier_preparer
+    columns = ", ".join(preparer.format_column(table.c[key]) for key in column_keys)
+    placeholders = ", ".join("%s" for _ in column_keys)
+    return f"INSERT INTO {preparer.format_table(table)} ({columns}) VALUES ({placeholders})"
+
+
+def _batched(iterable: typing.Iterable[_T], size: int) -> typing.Iterator[typing.List[_T]]:
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
 
 
 class SQLAlchemyCRUDRepository(AbstractCRUDRepository[SQLAlchemyModel]):
     def __init__(
             self,
-            session_or_pool: typing.Union[sessionmaker, AsyncSession],
+            session: AsyncSession,
             model: typing.Optional[typing.Type[SQLAlchemyModel]] = None,
     ) -> None:
         AbstractCRUDRepository.__init__(self, model)
-        if isinstance(session_or_pool, sessionmaker):
-            self._session: AsyncSession = typing.cast(AsyncSession, session_or_pool())
-        else:
-            self._session = session_or_pool
+        self._session = session
+        self._query_model_views: typing.Dict[
+            typing.Type[typing.Any], SQLAlchemyCRUDRepository[typing.Any]
+        ] = {}
 
     async def add(self, **values: typing.Any) -> int:
-        insert_stmt = insert(self.model).values(**values)
+        model = self.model
+        primary_key = model.__table__.c.id  # type: ignore
+        insert_stmt = insert(model).values(**values).returning(primary_key)
         result = await self._session.execute(insert_stmt)
-        return typing.cast(int, result.scalar())
+        return typing.cast(int, result.scalar_one())
 
     async def add_many(self, *models: SQLAlchemyModel) -> None:
-        bulk_save_func = make_proxy_bulk_save_func(instances=models)
-        await self._session.run_sync(bulk_save_func)
+        model = self.model
+        table = model.__table__  # type: ignore
+        column_keys = [column.key for column in table.columns]
+        rows: typing.List[typing.Dict[str, typing.Any]] = []
+        append_row = rows.append
+        for instance in models:
+            values = {key: getattr(instance, key, None) for key in column_keys}
+            append_row({key: value for key, value in values.items() if value is not None})
+        if len(rows) > DRIVER_EXECUTEMANY_THRESHOLD:
+            connection = await self._session.connection()
+            if _accepts_driver_values(connection.dialect, table):
+                await self._executemany_with_driver(connection, table, rows)
+                return None
+        insert_stmt = insert(model)
+        execute = self._session.execute
+        # a multi-row VALUES clause requires the same set of columns in every row
+        for _, same_columns_rows in itertools.groupby(rows, key=lambda row: tuple(row)):
+            for batch in _batched(same_columns_rows, BULK_INSERT_BATCH_SIZE):
+                await execute(insert_stmt.values(batch))
+
+    @staticmethod
+    async def _executemany_with_driver(
+            connection: AsyncConnection,
+            table: Table,
+            rows: typing.List[typing.Dict[str, typing.Any]],
+    ) -> None:
+        """
+        Skips statement compilation and bind processing of SQLAlchemy, so the caller has to make
+        sure that no column type of the table needs bind processing.
+        """
+        dialect = connection.dialect
+        exec_driver_sql = connection.exec_driver_sql
+        for column_keys, same_columns_rows in itertools.groupby(rows, key=lambda row: tuple(row)):
+            parameters = [tuple(row.values()) for row in same_columns_rows]
+            await exec_driver_sql(
+                _driver_insert_statement(dialect, table, column_keys),
+                # positional tuples match the "format" paramstyle, the stubs only declare mappings
+                typing.cast(typing.Sequence[typing.Mapping[str, typing.Any]], parameters),
+            )
 
     async def get_all(self, *clauses: ExpressionType) -> typing.List[SQLAlchemyModel]:
-        query_model = self.model
-        stmt = lambda_stmt(lambda: select(query_model))
-        stmt += lambda s: s.where(*clauses)
-        result = (
-            (await self._session.execute(typing.cast(Executable, stmt))).scalars().all()
-        )
+        stmt = _select_statement(self.model).where(*clauses)
+        result = (await self._session.execute(stmt)).scalars().all()
         return result
 
+    async def iter_all(self, *clauses: ExpressionType) -> typing.AsyncIterator[SQLAlchemyModel]:
+        stmt = (
+            _select_statement(self.model)
+            .where(*clauses)
+            .execution_options(yield_per=STREAM_YIELD_PER)
+        )
+        result = await self._session.stream_scalars(stmt)
+        try:
+            async for model in result:
+                yield model
+        finally:
+            # releases the server-side cursor when the consumer stops before exhausting rows
+            await result.close()
+
     async def get_one(
             self, *clauses: ExpressionType
     ) -> typing.Optional[SQLAlchemyModel]:
-        query_model = self.model
-        stmt = lambda_stmt(lambda: select(query_model))
-        stmt += lambda s: s.where(*clauses)
-        result = (
-            (await self._session.execute(typing.cast(Executable, stmt)))
-                .scalars()
-                .first()
-        )
+        stmt = _select_statement(self.model).where(*clauses)
+        result = (await self._session.execute(stmt)).scalars().first()
         return typing.cast(typing.Optional[SQLAlchemyModel], result)
 
     async def update(self, *clauses: ExpressionType, **values: typing.Any) -> None:
-        stmt = update(self.model).where(*clauses).values(**values).returning(None)
+        stmt = _update_statement(self.model).where(*clauses).values(**values).returning(None)
         await self._session.execute(stmt)
         return None
 
     async def exists(self, *clauses: ExpressionType) -> bool:
-        stmt = exists(select(self.model).where(*clauses)).select()
+        stmt = select(literal_column("1")).select_from(self.model).where(*clauses).limit(1)
         result = (await self._session.execute(stmt)).scalar()
-        return typing.cast(bool, result)
+        return result is not None
 
-    async def delete(self, *clauses: ExpressionType) -> typing.List[SQLAlchemyModel]:
-        stmt = delete(self.model).where(*clauses).returning(ASTERISK)
-        result = (await self._session.execute(stmt)).scalars().all()
-        return typing.cast(typing.List[SQLAlchemyModel], result)
+    async def delete(self, *clauses: ExpressionType) -> None:
+        stmt = _delete_statement(self.model).where(*clauses)
+        await self._session.execute(stmt)
+        return None
+
+    async def delete_by_pk(self, pk: int) -> None:
+        await self._session.execute(_delete_by_pk_statement(self.model), {"pk": pk})
+        return None
+
+    async def delete_returning(self, *clauses: ExpressionType) -> typing.List[Row]:
+        model = self.model
+        stmt = _delete_statement(model).where(*clauses).returning(model)
+        result = (await self._session.execute(stmt)).all()
+        return typing.cast(typing.List[Row], result)
 
     async def count(self, *clauses: ExpressionType) -> int:
-        stmt = lambda_stmt(lambda: select(func.count(ASTERISK)))
-        if clauses:
-            stmt += lambda s: s.where(*clauses)
-        result = (await self._session.execute(typing.cast(Executable, stmt))).scalar()
+        stmt = select(func.count()).select_from(self.model).where(*clauses)
+        result = (await self._session.execute(stmt)).scalar()
 
         return typing.cast(int, result)
+
+    def with_changed_query_model(self, /, model: typing.Type[_T]) -> SQLAlchemyCRUDRepository[_T]:
+        if model is self.model:
+            return self  # type: ignore
+        views = self._query_model_views
+        repository = views.get(model)
+        if repository is None:
+            repository = SQLAlchemyCRUDRepository(self._session, model)
+            views[model] = repository
+        return repository
@@ -1,8 +1,7 @@
 from typing import cast, List
 
-from sqlalchemy import delete, insert, lambda_stmt, select
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import Executable
 
 from src.domain.entities.order import Order
 from src.infrastructure.implementation.database.errors import QueryErrors
@@ -38,12 +37,9 @@ class OrderRepositoryImpl:
         return cast(int, order_id)
 
     async def delete_order_by_id(self, order_id: int) -> None:
-        delete_statement = delete(OrderModel).where(OrderModel.id == order_id)
-        await self._session.execute(delete_statement)
-        delete_in_m2m_table = delete(OrderItemModel).where(OrderItemModel.order_id == order_id)
-        await self._session.execute(delete_in_m2m_table)
+        # order_items rows are removed by the ON DELETE CASCADE foreign key
+        await self._crud_repository.delete_by_pk(order_id)
 
     async def get_all_orders(self) -> List[Order]:
-        stmt = lambda_stmt(lambda: select(OrderModel))
-        result = ((await self._session.execute(cast(Executable, stmt))).unique().scalars().all())
-        return result
+        result = await self._crud_repository.get_all()
+        return cast(List[Order], result)
@@ -24,6 +24,10 @@ class AbstractCRUDRepository(abc.ABC, typing.Generic[EntryType]):
     async def get_all(self, *clauses: typing.Any) -> typing.List[EntryType]:
         pass
 
+    @abc.abstractmethod
+    def iter_all(self, *clauses: typing.Any) -> typing.AsyncIterator[EntryType]:
+        pass
+
     @abc.abstractmethod
     async def get_one(self, *clauses: typing.Any) -> typing.Optional[EntryType]:
         pass
@@ -33,7 +37,16 @@ class AbstractCRUDRepository(abc.ABC, typing.Generic[EntryType]):
         pass
 
     @abc.abstractmethod
-    async def delete(self, *clauses: typing.Any) -> typing.List[EntryType]:
+    async def delete(self, *clauses: typing.Any) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def delete_by_pk(self, pk: int) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def delete_returning(self, *clauses: typing.Any) -> typing.List[typing.Any]:
+        """Deletes matching entries and returns the column values of every deleted row."""
         pass
 
     async def exists(self, *clauses: typing.Any) -> typing.Any:  # type: ignore
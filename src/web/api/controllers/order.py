@@ -31,7 +31,7 @@ AnyResult = Result[Any]
 class OrderController(RegistrableApiController):
 
     async def get_order(self, order_id: int) -> Response:
-        result: AnyResult = await self._mediator.handle(GetOrderByIdQuery(id=order_id))
+        result: AnyResult = await self._mediator.handle(GetOrderByIdQuery.construct(id=order_id))
         if result.failed:
             return self.status_code(HTTPStatus.NOT_FOUND)
         return self.pretty_json(result.value)
@@ -39,7 +39,7 @@ class OrderController(RegistrableApiController):
     async def create_order(self, gasket: FromJSON[CreateOrderDto]) -> Response:
         create_order_dto = gasket.value
         result: AnyResult = await self._mediator.handle(
-            CreateOrderCommand(create_order_dto=create_order_dto)
+            CreateOrderCommand.construct(create_order_dto=create_order_dto)
         )
         if result.failed:
             return self.status_code(
@@ -58,7 +58,7 @@ class OrderController(RegistrableApiController):
         return self.status_code(status=HTTPStatus.NO_CONTENT)
 
     async def get_all_orders(self) -> Response:
-        result: AnyResult = await self._mediator.handle(GetAllOrdersQuery())
+        result: AnyResult = await self._mediator.handle(GetAllOrdersQuery.construct())
         if result.failed:
             return self.status_code(
                 HTTPStatus.INTERNAL_SERVER_ERROR, result.error_message
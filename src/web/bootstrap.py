@@ -5,6 +5,7 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.schedulers.base import BaseScheduler
 from apscheduler_di import ContextSchedulerDecorator
 from blacksheep.server import Application
+from blacksheep.server.di import dependency_injection_middleware
 from blacksheep.server.openapi.v3 import OpenAPIHandler
 from blacksheep.server.routing import RoutesRegistry
 from blacksheep_prometheus import metrics, PrometheusMiddleware
@@ -25,8 +26,9 @@ from src.utils.logging import configure_logging, LoggingConfig
 from src.web.api import controllers
 from src.web.events import on_shutdown, on_startup
 from src.web.factories import user_repository_factory, authentication_service_factory, \
-    token_issuer_factory, mediator_factory, openapi_docs_factory
+    token_issuer_factory, mediator_factory, openapi_docs_factory, session_factory
 from src.web.middlewares.logging_middleware import LoggingMiddleware
+from src.web.middlewares.session_middleware import ScopedSessionMiddleware
 from src.web.util.blacksheep_context import plugins
 from src.web.util.blacksheep_context.integration.structlog import StructlogContextVarBindMiddleware
 from src.web.util.blacksheep_context.middleware import RawContextMiddleware
@@ -63,6 +65,9 @@ class ApplicationBuilder:
         self._application.on_stop += on_shutdown
 
     def _setup_middlewares(self) -> None:
+        # opens the scope of services, which is shared by all dependencies of a request
+        self._application.middlewares.append(dependency_injection_middleware)
+        self._application.middlewares.append(ScopedSessionMiddleware())
         self._application.middlewares.append(RawContextMiddleware(plugins=(
             plugins.RequestIdPlugin(),
             plugins.CorrelationIdPlugin()
@@ -92,15 +97,18 @@ class ApplicationBuilder:
         engine = create_async_engine(
             url=self._settings.db.connection_uri,
             future=True,
-            query_cache_size=1200,
-            pool_size=100,
-            max_overflow=200,
+            query_cache_size=self._settings.db.query_cache_size,
+            pool_size=20,
+            max_overflow=10,
+            pool_pre_ping=False,
+            pool_recycle=3600,
             echo=True,
             echo_pool=True
         )
         session_pool = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
         self._application.services.add_instance(engine, AsyncEngine)
         self._application.services.add_instance(session_pool, sessionmaker)
+        self._application.services.add_scoped_by_factory(session_factory, AsyncSession)
 
         # CQRS
         self._application.services.add_transient_by_factory(mediator_factory, MediatorInterface)
@@ -3,6 +3,7 @@ from blacksheep.server.openapi.v3 import OpenAPIHandler
 from dynaconf import LazySettings
 from openapidocs.v3 import Info
 from rodi import GetServiceContext
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 from src.application.application_services.implementation.security.jwt.authentication import \
@@ -28,14 +29,18 @@ from src.infrastructure.interfaces.database.repositories.customer.repository imp
 from src.utils.cqrs_lib import MediatorImpl, MediatorInterface
 
 
+def session_factory(services: GetServiceContext) -> AsyncSession:
+    return services.provider.get(sessionmaker)()
+
+
 def user_repository_factory(services: GetServiceContext) -> UserRepository:
-    session = services.provider.get(sessionmaker)()
+    session = services.provider.get(AsyncSession, services)
     return UserRepositoryImpl(session)
 
 
 def authentication_service_factory(services: GetServiceContext) -> AuthenticationService:
     settings = services.provider.get(LazySettings)
-    customer_repository = services.provider.get(UserRepository)
+    customer_repository = services.provider.get(UserRepository, services)
     return JWTAuthenticationService(
         token_decoder=JWTTokenDecoder(
             secret_key=settings.web.auth.secret_key,
@@ -47,7 +52,7 @@ def authentication_service_factory(services: GetServiceContext) -> Authenticatio
 
 def token_issuer_factory(services: GetServiceContext) -> TokenIssuer:
     settings = services.provider.get(LazySettings)
-    user_repository = services.provider.get(UserRepository)
+    user_repository = services.provider.get(UserRepository, services)
     return JWTTokenIssuer(
         user_repository=user_repository,
         secret_key=settings.web.auth.secret_key,
@@ -57,7 +62,7 @@ def token_issuer_factory(services: GetServiceContext) -> TokenIssuer:
 
 
 def mediator_factory(services: GetServiceContext) -> MediatorInterface:
-    session = services.provider.get(sessionmaker)()
+    session = services.provider.get(AsyncSession, services)
     order_repository = OrderRepositoryImpl(session)
     uow = SQLAlchemyUnitOfWork(session)
     order_domain_service = OrderServiceImpl(DeliveryServiceImpl())
@@ -0,0 +1,22 @@
+from typing import Awaitable, Callable
+
+from blacksheep.messages import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class ScopedSessionMiddleware:
+    """
+    Closes the AsyncSession created for the request's services scope, so its connection
+    is returned to the pool right after the request instead of when the session is collected.
+    Must be placed after blacksheep's dependency_injection_middleware.
+    """
+
+    async def __call__(
+            self, request: Request, next_handler: Callable[[Request], Awaitable[Response]]
+    ) -> Response:
+        try:
+            return await next_handler(request)
+        finally:
+            session = request.services_context.scoped_services.get(AsyncSession)  # type: ignore
+            if session is not None:
+                await session.close()
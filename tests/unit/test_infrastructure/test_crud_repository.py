@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+from typing import Any, List, Optional, Tuple
+
+import pytest
+from sqlalchemy import JSON, Column, INTEGER, Table
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+from sqlalchemy.orm import registry
+
+from src.infrastructure.implementation.database.orm.models import OrderItemModel, OrderModel, UserModel
+from src.infrastructure.implementation.database.repositories.crud_repository import (
+    DRIVER_EXECUTEMANY_THRESHOLD,
+    STREAM_YIELD_PER,
+    SQLAlchemyCRUDRepository,
+)
+
+
+class RecordingConnection:
+    def __init__(self) -> None:
+        self.dialect = PGDialect_asyncpg()
+        self.driver_statements: List[Tuple[str, List[Tuple[Any, ...]]]] = []
+
+    async def exec_driver_sql(self, statement: str, parameters: List[Tuple[Any, ...]]) -> None:
+        self.driver_statements.append((statement, parameters))
+
+
+class RecordingResult:
+    def __init__(self, scalar: Any) -> None:
+        self._scalar = scalar
+
+    def scalar(self) -> Any:
+        return self._scalar
+
+
+class RecordingScalarResult:
+    def __init__(self, rows: List[Any]) -> None:
+        self._rows = iter(rows)
+        self.closed = False
+
+    def __aiter__(self) -> RecordingScalarResult:
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            return next(self._rows)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class RecordingSession:
+    def __init__(self) -> None:
+        self.statements: List[Any] = []
+        self.parameters: List[Optional[Any]] = []
+        self.scalar: Any = None
+        self.rows: List[Any] = []
+        self.scalar_results: List[RecordingScalarResult] = []
+        self.recording_connection = RecordingConnection()
+
+    async def execute(self, statement: Any, parameters: Optional[Any] = None) -> RecordingResult:
+        self.statements.append(statement)
+        self.parameters.append(parameters)
+        return RecordingResult(self.scalar)
+
+    async def stream_scalars(self, statement: Any) -> RecordingScalarResult:
+        self.statements.append(statement)
+        scalar_result = RecordingScalarResult(self.rows)
+        self.scalar_results.append(scalar_result)
+        return scalar_result
+
+    async def connection(self) -> RecordingConnection:
+        return self.recording_connection
+
+
+test_registry: registry = registry()
+
+
+@test_registry.mapped
+class DocumentModel:
+    __table__ = Table(
+        "documents",
+        test_registry.metadata,
+        Column("id", INTEGER, primary_key=True),
+        Column("payload", JSON, nullable=False),
+    )
+
+
+@pytest.fixture()
+def session() -> RecordingSession:
+    return RecordingSession()
+
+
+@pytest.fixture()
+def order_item_repository(session: RecordingSession) -> SQLAlchemyCRUDRepository:
+    return SQLAlchemyCRUDRepository(session, model=OrderItemModel)  # type: ignore
+
+
+@pytest.fixture()
+def order_repository(session: RecordingSession) -> SQLAlchemyCRUDRepository:
+    return SQLAlchemyCRUDRepository(session, model=OrderModel)  # type: ignore
+
+
+def compile_statement(statement: Any) -> Any:
+    return statement.compile(dialect=postgresql.dialect())
+
+
+@pytest.mark.asyncio
+async def test_add_many_splits_rows_filling_different_columns(
+        order_item_repository: SQLAlchemyCRUDRepository, session: RecordingSession
+) -> None:
+    await order_item_repository.add_many(
+        OrderItemModel(id=None, order_id=1, product_id=1, quantity=5),
+        OrderItemModel(id=None, order_id=2, product_id=1, quantity=None),
+        OrderItemModel(id=None, order_id=3, product_id=2, quantity=None),
+        OrderItemModel(id=None, order_id=4, product_id=2, quantity=3),
+    )
+
+    compiled = [compile_statement(statement) for statement in session.statements]
+
+    assert [sorted(statement.params) for statement in compiled] == [
+        ["order_id_m0", "product_id_m0", "quantity_m0"],
+        ["order_id_m0", "order_id_m1", "product_id_m0", "product_id_m1"],
+        ["order_id_m0", "product_id_m0", "quantity_m0"],
+    ]
+    assert [statement.params["order_id_m0"] for statement in compiled] == [1, 2, 4]
+
+
+@pytest.mark.asyncio
+async def test_add_many_inserts_rows_with_same_columns_at_once(
+        order_item_repository: SQLAlchemyCRUDRepository, session: RecordingSession
+) -> None:
+    await order_item_repository.add_many(
+        OrderItemModel(id=None, order_id=1, product_id=1, quantity=5),
+        OrderItemModel(id=None, order_id=2, product_id=1, quantity=2),
+    )
+
+    assert len(session.statements) == 1
+    assert "VALUES (%(order_id_m0)s, %(product_id_m0)s, %(quantity_m0)s), " in str(
+        compile_statement(session.statements[0])
+    )
+
+
+@pytest.mark.asyncio
+async def test_add_many_passes_large_batches_to_driver_in_order(
+        order_item_repository: SQLAlchemyCRUDRepository, session: RecordingSession
+) -> None:
+    rows_count = DRIVER_EXECUTEMANY_THRESHOLD * 3
+    await order_item_repository.add_many(
+        *(
+            OrderItemModel(
+                id=None, order_id=i, product_id=1, quantity=2 if i // DRIVER_EXECUTEMANY_THRESHOLD == 1 else None
+            )
+            for i in range(rows_count)
+        )
+    )
+
+    driver_statements = session.recording_connection.driver_statements
+    assert session.statements == []
+    assert [statement for statement, _ in driver_statements] == [
+        "INSERT INTO order_items (order_id, product_id) VALUES (%s, %s)",
+        "INSERT INTO order_items (order_id, product_id, quantity) VALUES (%s, %s, %s)",
+        "INSERT INTO order_items (order_id, product_id) VALUES (%s, %s)",
+    ]
+    order_ids = [row[0] for _, parameters in driver_statements for row in parameters]
+    assert order_ids == list(range(rows_count))
+
+
+@pytest.mark.asyncio
+async def test_add_many_keeps_bind_processing_for_large_batches(session: RecordingSession) -> None:
+    repository = SQLAlchemyCRUDRepository(session, model=DocumentModel)  # type: ignore
+    await repository.add_many(
+        *(DocumentModel(payload={"n": i}) for i in range(DRIVER_EXECUTEMANY_THRESHOLD + 1))
+    )
+
+    assert session.recording_connection.driver_statements == []
+    assert len(session.statements) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("scalar, expected", [(1, True), (None, False)])
+async def test_exists_selects_constant_with_limit(
+        session: RecordingSession, scalar: Optional[int], expected: bool
+) -> None:
+    session.scalar = scalar
+    repository = SQLAlchemyCRUDRepository(session, model=UserModel)  # type: ignore
+
+    assert await repository.exists(UserModel.username == "GLEF1X") is expected
+    assert str(compile_statement(session.statements[0])) == (
+        "SELECT 1 \nFROM users \nWHERE users.username = %(username_1)s \n LIMIT %(param_1)s"
+    )
+
+
+@pytest.mark.asyncio
+async def test_count_without_clauses_selects_from_model_table(
+        order_repository: SQLAlchemyCRUDRepository, session: RecordingSession
+) -> None:
+    session.scalar = 3
+
+    assert await order_repository.count() == 3
+    assert str(compile_statement(session.statements[0])) == "SELECT count(*) AS count_1 \nFROM orders"
+
+
+@pytest.mark.asyncio
+async def test_count_applies_clauses(
+        order_repository: SQLAlchemyCRUDRepository, session: RecordingSession
+) -> None:
+    await order_repository.count(OrderModel.user_id == 1)
+
+    assert str(compile_statement(session.statements[0])) == (
+        "SELECT count(*) AS count_1 \nFROM orders \nWHERE orders.user_id = %(user_id_1)s"
+    )
+
+
+@pytest.mark.asyncio
+async def test_delete_by_pk_reuses_statement_with_bound_pk(
+        order_repository: SQLAlchemyCRUDRepository, session: RecordingSession
+) -> None:
+    await order_repository.delete_by_pk(7)
+    await order_repository.delete_by_pk(8)
+
+    assert session.statements[0] is session.statements[1]
+    assert session.statements[0].get_execution_options()["synchronize_session"] == "fetch"
+    assert str(compile_statement(session.statements[0])) == "DELETE FROM orders WHERE orders.id = %(pk)s"
+    assert session.parameters == [{"pk": 7}, {"pk": 8}]
+
+
+@pytest.mark.asyncio
+async def test_iter_all_streams_filtered_select(
+        order_repository: SQLAlchemyCRUDRepository, session: RecordingSession
+) -> None:
+    session.rows = ["first order", "second order"]
+
+    streamed = [order async for order in order_repository.iter_all(OrderModel.id > 2)]
+
+    statement = session.statements[0]
+    assert streamed == ["first order", "second order"]
+    assert session.scalar_results[0].closed
+    assert statement.get_execution_options()["yield_per"] == STREAM_YIELD_PER
+    assert str(compile_statement(statement)) == (
+        "SELECT orders.id, orders.created_at, orders.order_date, orders.user_id \n"
+        "FROM orders \nWHERE orders.id > %(id_1)s"
+    )
+
+
+@pytest.mark.asyncio
+async def test_iter_all_closes_result_when_consumer_stops_early(
+        order_repository: SQLAlchemyCRUDRepository, session: RecordingSession
+) -> None:
+    session.rows = ["first order", "second order"]
+
+    orders = order_repository.iter_all()
+    assert await orders.__anext__() == "first order"
+    await orders.aclose()
+
+    assert session.scalar_results[0].closed